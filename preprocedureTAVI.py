@@ -2,6 +2,7 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 
 def check_password():
@@ -58,6 +59,27 @@ DEFAULTS = {
     "valve_type": "Balloon-Expandable",
 }
 
+# --------------------------
+# Session History Settings
+# --------------------------
+HISTORY_CAP = 200
+HISTORY_SEXES = ("Male", "Female")
+HISTORY_CATEGORIES = ("Low", "Intermediate", "High", "Very High")
+HISTORY_DTYPES = {
+    "patient_no": np.uint32,
+    "recorded_at": "datetime64[s]",
+    "age": np.uint8,
+    "sex": np.int8,
+    "bmi": np.float32,
+    "cfs": np.uint8,
+    "lvef": np.uint8,
+    "procedural": np.bool_,
+    "score": np.float32,
+    "category": np.int8,
+    "los_min": np.uint8,
+    "los_max": np.uint8,
+}
+
 # --------------------------
 # Custom Global Styling
 # --------------------------
@@ -114,6 +136,69 @@ if "active_tab" not in st.session_state:
 for key, val in DEFAULTS.items():
     st.session_state.setdefault(key, val)
 
+# --------------------------
+# Session History
+# --------------------------
+def create_history(cap=HISTORY_CAP):
+    # Fixed-size columnar ring buffer: one preallocated array per field
+    columns = {name: np.zeros(cap, dtype=dtype) for name, dtype in HISTORY_DTYPES.items()}
+    return {"columns": columns, "cap": cap, "count": 0, "total": 0}
+
+def record_history(history, result):
+    score, category, los, color, color_code, contributing_factors, los_min, los_max = result
+    cols = history["columns"]
+    i = history["total"] % history["cap"]
+    history["total"] += 1
+    history["count"] = min(history["count"] + 1, history["cap"])
+
+    cols["patient_no"][i] = history["total"]
+    cols["recorded_at"][i] = np.datetime64(datetime.now(), "s")
+    cols["age"][i] = st.session_state.age
+    cols["sex"][i] = HISTORY_SEXES.index(st.session_state.sex)
+    cols["bmi"][i] = st.session_state.bmi
+    cols["cfs"][i] = st.session_state.cfs
+    cols["lvef"][i] = st.session_state.lvef
+    cols["procedural"][i] = st.session_state.include_procedural
+    cols["score"][i] = score
+    cols["category"][i] = HISTORY_CATEGORIES.index(category)
+    cols["los_min"][i] = los_min
+    cols["los_max"][i] = los_max
+
+def history_dataframe(history):
+    count, cap = history["count"], history["cap"]
+    # Oldest entry sits at the write position once the buffer has wrapped
+    start = history["total"] % cap if count == cap else 0
+    order = (np.arange(count) + start) % cap
+    cols = {name: arr[order] for name, arr in history["columns"].items()}
+    return pd.DataFrame({
+        "Patient #": cols["patient_no"],
+        "Recorded": cols["recorded_at"],
+        "Age": cols["age"],
+        "Sex": pd.Categorical.from_codes(cols["sex"], HISTORY_SEXES),
+        "BMI": cols["bmi"],
+        "CFS": cols["cfs"],
+        "LVEF (%)": cols["lvef"],
+        "Procedural": cols["procedural"],
+        "Score": cols["score"],
+        "Category": pd.Categorical.from_codes(cols["category"], HISTORY_CATEGORIES, ordered=True),
+        "LOS Min (days)": cols["los_min"],
+        "LOS Max (days)": cols["los_max"],
+    })
+
+def show_history(history):
+    if history["count"] == 0:
+        return
+    with st.expander(f"🗂️ Session Patient History ({history['count']})", expanded=False):
+        if history["total"] > history["cap"]:
+            st.caption(f"Showing the most recent {history['cap']} of {history['total']} patients this session.")
+        df = history_dataframe(history)
+        st.dataframe(df, hide_index=True, use_container_width=True)
+        st.download_button("⬇️ Download History (CSV)", df.to_csv(index=False).encode("utf-8"),
+                           file_name="tavi_los_history.csv", mime="text/csv", use_container_width=True)
+
+if "history" not in st.session_state:
+    st.session_state.history = create_history()
+
 # --------------------------
 # Risk Score Calculation
 # --------------------------
@@ -418,6 +503,7 @@ if selected_tab == "Assessment":
                 st.session_state.pulm_hypertension, st.session_state.cfs,
                 st.session_state.approach
             )
+        record_history(st.session_state.history, st.session_state.result)
         st.session_state.active_tab = "Results"
         st.rerun()
 
@@ -461,6 +547,8 @@ elif selected_tab == "Results":
             st.session_state.active_tab = "Assessment"
             st.rerun()
 
+    show_history(st.session_state.history)
+
 # --------------------------
 # Disclaimer Tab
 # --------------------------